@@ -12,8 +12,12 @@ from typing import Optional
 from data_loader import (
     load_all_data,
     validate_results_structure,
+    get_results_mtime,
     filter_dataframe,
-    get_explainability_image_path
+    top_n_rows,
+    sample_per_risk_band,
+    probability_histogram,
+    build_case_lookup
 )
 from ui import (
     render_hero_banner,
@@ -22,7 +26,7 @@ from ui import (
     render_sidebar_nav_pills,
     render_sidebar_status_card,
     render_connection_status,
-    render_kpi_card_clickable,
+    render_kpi_row,
     render_global_filter_bar,
     render_artifact_cards,
     render_case_detail_card
@@ -47,24 +51,43 @@ def load_css():
 load_css()
 
 
-@st.cache_data
-def cached_load_data(results_root: Path, demo_mode: bool = False):
-    """Cached data loading."""
+@st.cache_data(persist="disk", show_spinner="Loading results...", max_entries=4)
+def cached_load_data(results_root: Path, demo_mode: bool = False, results_mtime: float = 0.0):
+    """Cached data loading, persisted to disk and keyed on the results mtime."""
     return load_all_data(results_root, demo_mode)
 
 
-def get_folder_name(results_root: Path) -> Optional[str]:
-    """Get folder name without exposing full path."""
-    try:
-        name = results_root.name
-        # Only return if it's a simple name (no path separators)
-        if name and '/' not in name and '\\' not in name and ':' not in name:
-            return name
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_validate_results(results_root: Path, results_mtime: float = 0.0):
+    """Cached results folder validation, keyed on the same mtime as the data."""
+    return validate_results_structure(results_root)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_read_image(image_path: Path, image_mtime: float) -> bytes:
+    """Explainability PNG bytes, shared by the image view and its download button."""
+    return image_path.read_bytes()
+
+
+def load_case_image(image_path: Optional[Path]) -> Optional[bytes]:
+    """Read a case image through the bytes cache, or None if missing or unreadable."""
+    if image_path is None:
         return None
-    except:
+    try:
+        return cached_read_image(image_path, image_path.stat().st_mtime)
+    except OSError:
         return None
 
 
+def get_folder_name(results_root: Path) -> Optional[str]:
+    """Get folder name without exposing full path."""
+    name = results_root.name
+    # Path.name never contains '/', but a POSIX name can still hold '\\' or ':'
+    if name and '\\' not in name and ':' not in name:
+        return name
+    return None
+
+
 def sidebar_setup():
     """Premium sidebar setup with branded header and navigation."""
     # Brand header
@@ -92,9 +115,12 @@ def sidebar_setup():
         help="Use synthetic demo data"
     )
     
+    # Shared cache key for validation and data loading
+    results_mtime = 0.0 if demo_mode else get_results_mtime(results_root)
+    
     # Connection status (NO PATH EXPOSURE)
     if not demo_mode:
-        is_valid, missing = validate_results_structure(results_root)
+        is_valid, missing = cached_validate_results(results_root, results_mtime)
         if is_valid:
             folder_name = get_folder_name(results_root)
             render_connection_status(True, folder_name)
@@ -122,11 +148,36 @@ def sidebar_setup():
     # Render nav pills (visual only, radio handles selection)
     render_sidebar_nav_pills(page)
     
-    return results_root, demo_mode, page
+    return results_root, demo_mode, page, results_mtime
 
 
-def apply_global_filters(index_df, filters):
-    """Apply global filters to dataframe."""
+@st.cache_resource(show_spinner=False, max_entries=4)
+def cached_case_lookup(_index_df, index_fingerprint: str):
+    """Shared case_id -> row lookup, built once per loaded index."""
+    return build_case_lookup(_index_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def cached_case_ids_lower(_index_df, index_fingerprint: str):
+    """Lowercased case_ids for the search box, built once per loaded index."""
+    return _index_df['case_id'].str.lower()
+
+
+def apply_global_filters(index_df, filters, index_fingerprint: Optional[str] = None):
+    """Apply global filters to dataframe, memoized per index fingerprint and filters."""
+    if index_fingerprint is None:
+        return _filter_index(index_df, filters)
+    return cached_filter_index(index_df, index_fingerprint, filters)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_filter_index(_index_df, index_fingerprint: str, filters: dict):
+    """Cached filter application; the frame itself is identified by its fingerprint."""
+    return _filter_index(_index_df, filters)
+
+
+def _filter_index(index_df, filters):
+    """Translate the filter bar state into filter_dataframe arguments."""
     return filter_dataframe(
         index_df,
         risk_bands=filters.get('risk_bands'),
@@ -170,39 +221,39 @@ def page_dashboard(data: dict, results_root: Path):
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Global Filter Bar (collapsible)
-    filters = render_global_filter_bar(index_df, key_prefix="dashboard")
-    filtered_df = apply_global_filters(index_df, filters)
+    filters = render_global_filter_bar(data['filter_options'], key_prefix="dashboard")
+    filtered_df = apply_global_filters(index_df, filters, data.get('index_fingerprint'))
     
     st.info(f"Showing {len(filtered_df)} of {len(index_df)} cases")
     
     # Compute metrics
     n_cases = len(filtered_df)
-    n_high_risk = len(filtered_df[filtered_df['risk_band'] == 'HIGH']) if 'risk_band' in filtered_df.columns else 0
+    # Categorical risk_band counts come back in LOW -> HIGH order, including empty bands
+    band_counts = filtered_df['risk_band'].value_counts(sort=False) if 'risk_band' in filtered_df.columns else None
+    n_high_risk = int(band_counts.get('HIGH', 0)) if band_counts is not None else 0
     pct_high = (n_high_risk / n_cases * 100) if n_cases > 0 else 0
-    avg_prob = filtered_df['p_calibrated'].mean() if 'p_calibrated' in filtered_df.columns else 0
-    avg_uncert = filtered_df['uncertainty_std'].mean() if 'uncertainty_std' in filtered_df.columns else 0
+    mean_cols = [c for c in ('p_calibrated', 'uncertainty_std') if c in filtered_df.columns]
+    means = filtered_df[mean_cols].mean()
+    avg_prob = means.get('p_calibrated', 0)
+    avg_uncert = means.get('uncertainty_std', 0)
     n_images = artifacts.get('case_image_count', 0)
     
     # KPI Cards
     st.markdown("### Key Metrics", unsafe_allow_html=True)
-    kpi_cols = st.columns(5)
-    
-    with kpi_cols[0]:
-        # Show total cases with note if subset
-        subtitle = ""
-        if run_config and run_config.get('n_patients'):
-            total_patients = run_config.get('n_patients', 0)
-            if total_patients > n_cases:
-                subtitle = f"of {total_patients} patients"
-        render_kpi_card_clickable("Cases with Reports", str(n_cases), "📋", subtitle=subtitle, color="blue", clickable=False)
-    with kpi_cols[1]:
-        render_kpi_card_clickable("High Risk", f"{pct_high:.1f}%", "⚠️", f"{n_high_risk} cases", color="pink", clickable=False)
-    with kpi_cols[2]:
-        render_kpi_card_clickable("Avg Risk", f"{avg_prob:.3f}", "📊", color="yellow", clickable=False)
-    with kpi_cols[3]:
-        render_kpi_card_clickable("Avg Uncertainty", f"{avg_uncert:.3f}", "🔍", color="green", clickable=False)
-    with kpi_cols[4]:
-        render_kpi_card_clickable("Images Available", str(n_images), "🖼️", color="default", clickable=False)
+    
+    # Show total cases with note if subset
+    subtitle = ""
+    if run_config and run_config.get('n_patients'):
+        total_patients = run_config.get('n_patients', 0)
+        if total_patients > n_cases:
+            subtitle = f"of {total_patients} patients"
+    render_kpi_row([
+        {'title': "Cases with Reports", 'value': str(n_cases), 'icon': "📋", 'subtitle': subtitle, 'color': "blue"},
+        {'title': "High Risk", 'value': f"{pct_high:.1f}%", 'icon': "⚠️", 'subtitle': f"{n_high_risk} cases", 'color': "pink"},
+        {'title': "Avg Risk", 'value': f"{avg_prob:.3f}", 'icon': "📊", 'color': "yellow"},
+        {'title': "Avg Uncertainty", 'value': f"{avg_uncert:.3f}", 'icon': "🔍", 'color': "green"},
+        {'title': "Images Available", 'value': str(n_images), 'icon': "🖼️", 'color': "default"},
+    ])
     
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -213,7 +264,7 @@ def page_dashboard(data: dict, results_root: Path):
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.markdown("### 🔴 Top High-Risk Cases", unsafe_allow_html=True)
         if 'p_calibrated' in filtered_df.columns:
-            top_high = filtered_df.nlargest(5, 'p_calibrated')[['case_id', 'risk_band', 'p_calibrated']].copy()
+            top_high = top_n_rows(filtered_df, 'p_calibrated', 5)[['case_id', 'risk_band', 'p_calibrated']].copy()
             top_high['p_calibrated'] = top_high['p_calibrated'].round(3)
             top_high.columns = ['Case ID', 'Risk Band', 'Probability']
             st.dataframe(top_high, use_container_width=True, hide_index=True)
@@ -230,7 +281,7 @@ def page_dashboard(data: dict, results_root: Path):
         st.markdown('<div class="premium-card">', unsafe_allow_html=True)
         st.markdown("### 🔍 Top Most Uncertain Cases", unsafe_allow_html=True)
         if 'uncertainty_std' in filtered_df.columns:
-            top_uncert = filtered_df.nlargest(5, 'uncertainty_std')[['case_id', 'risk_band', 'uncertainty_std']].copy()
+            top_uncert = top_n_rows(filtered_df, 'uncertainty_std', 5)[['case_id', 'risk_band', 'uncertainty_std']].copy()
             top_uncert['uncertainty_std'] = top_uncert['uncertainty_std'].round(3)
             top_uncert.columns = ['Case ID', 'Risk Band', 'Uncertainty']
             st.dataframe(top_uncert, use_container_width=True, hide_index=True)
@@ -252,15 +303,18 @@ def page_dashboard(data: dict, results_root: Path):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("### Risk Distribution", unsafe_allow_html=True)
         if 'p_calibrated' in filtered_df.columns:
-            fig = px.histogram(
-                filtered_df,
+            hist_df = probability_histogram(filtered_df, bins=25)
+            fig = px.bar(
+                hist_df,
                 x='p_calibrated',
-                nbins=25,
+                y='count',
                 color_discrete_sequence=['#667eea'],
                 labels={'p_calibrated': 'Calibrated Probability', 'count': 'Cases'}
             )
+            fig.update_traces(width=hist_df['width'])
             fig.update_layout(
                 showlegend=False,
+                bargap=0,
                 height=350,
                 margin=dict(l=10, r=10, t=10, b=10),
                 plot_bgcolor='rgba(0,0,0,0)',
@@ -275,9 +329,11 @@ def page_dashboard(data: dict, results_root: Path):
     with chart_cols[1]:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("### Risk Band Counts", unsafe_allow_html=True)
-        if 'risk_band' in filtered_df.columns:
-            risk_counts = filtered_df['risk_band'].value_counts().reset_index()
-            risk_counts.columns = ['Risk Band', 'Count']
+        if band_counts is not None:
+            risk_counts = pd.DataFrame({
+                'Risk Band': band_counts.index.astype(str),
+                'Count': band_counts.to_numpy()
+            })
             
             fig = px.bar(
                 risk_counts,
@@ -309,7 +365,7 @@ def page_dashboard(data: dict, results_root: Path):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown("### Uncertainty vs Risk", unsafe_allow_html=True)
         fig = px.scatter(
-            filtered_df,
+            sample_per_risk_band(filtered_df, max_points=2000),
             x='p_calibrated',
             y='uncertainty_std',
             color='risk_band',
@@ -347,8 +403,8 @@ def page_case_explorer(data: dict, results_root: Path):
         return
     
     # Apply global filters
-    filters = render_global_filter_bar(index_df, key_prefix="explorer")
-    filtered_df = apply_global_filters(index_df, filters)
+    filters = render_global_filter_bar(data['filter_options'], key_prefix="explorer")
+    filtered_df = apply_global_filters(index_df, filters, data.get('index_fingerprint'))
     
     # Two column layout
     left_col, right_col = st.columns([1, 1.2])
@@ -359,7 +415,8 @@ def page_case_explorer(data: dict, results_root: Path):
         # Search
         search_term = st.text_input("🔍 Search Case ID", key="case_search")
         if search_term:
-            filtered_df = filtered_df[filtered_df['case_id'].str.contains(search_term, case=False, na=False)]
+            case_ids_lower = cached_case_ids_lower(index_df, data['index_fingerprint']).loc[filtered_df.index]
+            filtered_df = filtered_df[case_ids_lower.str.contains(search_term.lower(), regex=False, na=False).to_numpy()]
         
         # Display table (Case ID only, no patient_id)
         display_cols = ['case_id', 'risk_band', 'p_calibrated', 'uncertainty_std', 'y_true']
@@ -395,9 +452,9 @@ def page_case_explorer(data: dict, results_root: Path):
     
     with right_col:
         if selected_case:
-            case_data = filtered_df[filtered_df['case_id'] == selected_case].iloc[0].to_dict()
-            image_path = get_explainability_image_path(results_root, selected_case)
-            render_case_detail_card(case_data, image_path, results_root)
+            case_data = cached_case_lookup(index_df, data['index_fingerprint'])[selected_case]
+            image_bytes = load_case_image(data['image_paths'].get(selected_case))
+            render_case_detail_card(case_data, image_bytes, results_root)
         else:
             st.info("Select a case from the list to view details")
 
@@ -417,37 +474,33 @@ def page_performance(data: dict, results_root: Path):
         if metrics_summary is not None and not metrics_summary.empty:
             if len(metrics_summary) > 0:
                 model_row = metrics_summary.iloc[0]
-                metric_cols = st.columns(4)
-                
-                with metric_cols[0]:
-                    if 'AUC' in model_row:
-                        render_kpi_card_clickable("AUC", f"{model_row['AUC']:.3f}", "📈", color="blue", clickable=False)
-                with metric_cols[1]:
-                    if 'PR_AUC' in model_row:
-                        render_kpi_card_clickable("PR-AUC", f"{model_row['PR_AUC']:.3f}", "📊", color="green", clickable=False)
-                with metric_cols[2]:
-                    if 'Accuracy' in model_row:
-                        render_kpi_card_clickable("Accuracy", f"{model_row['Accuracy']:.3f}", "✅", color="yellow", clickable=False)
-                with metric_cols[3]:
-                    if 'F1' in model_row:
-                        render_kpi_card_clickable("F1 Score", f"{model_row['F1']:.3f}", "🎯", color="pink", clickable=False)
+                metric_cards = [
+                    ('AUC', "AUC", "📈", "blue"),
+                    ('PR_AUC', "PR-AUC", "📊", "green"),
+                    ('Accuracy', "Accuracy", "✅", "yellow"),
+                    ('F1', "F1 Score", "🎯", "pink"),
+                ]
+                render_kpi_row([
+                    {'title': title, 'value': f"{model_row[col]:.3f}", 'icon': icon, 'color': color}
+                    for col, title, icon, color in metric_cards
+                    if col in model_row
+                ])
             
             st.markdown("<br>", unsafe_allow_html=True)
             
             display_cols = ['model', 'AUC', 'PR_AUC', 'Sensitivity', 'Specificity', 'Accuracy', 'F1']
             available_cols = [c for c in display_cols if c in metrics_summary.columns]
             if available_cols:
+                # Fixed three decimals, formatted client-side rather than through a Styler
+                metric_format = {
+                    col: st.column_config.NumberColumn(format="%.3f")
+                    for col in available_cols if col != 'model'
+                }
                 st.dataframe(
-                    metrics_summary[available_cols].style.format({
-                        'AUC': '{:.3f}',
-                        'PR_AUC': '{:.3f}',
-                        'Sensitivity': '{:.3f}',
-                        'Specificity': '{:.3f}',
-                        'Accuracy': '{:.3f}',
-                        'F1': '{:.3f}'
-                    }),
+                    metrics_summary[available_cols],
                     use_container_width=True,
-                    hide_index=True
+                    hide_index=True,
+                    column_config=metric_format
                 )
         else:
             st.info("No metrics summary available")
@@ -513,7 +566,7 @@ def page_performance(data: dict, results_root: Path):
 def main():
     """Main application entry point."""
     # Sidebar setup
-    results_root, demo_mode, page = sidebar_setup()
+    results_root, demo_mode, page, results_mtime = sidebar_setup()
     
     # Handle page switching from buttons
     if 'page_switch' in st.session_state:
@@ -521,7 +574,7 @@ def main():
         del st.session_state.page_switch
     
     # Load data
-    data = cached_load_data(results_root, demo_mode=demo_mode)
+    data = cached_load_data(results_root, demo_mode=demo_mode, results_mtime=results_mtime)
     
     # Render status card in sidebar
     render_sidebar_status_card(data)
@@ -8,18 +8,93 @@ import numpy as np
 from pathlib import Path
 from typing import Tuple, Optional, Dict
 import json
+import os
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+    _POLARS_DTYPES = {}
+else:
+    _POLARS_DTYPES = {'str': pl.Utf8, 'int8': pl.Int8, 'float64': pl.Float64}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    _CSV_ENGINE = "c"
+
+RISK_BANDS = ["LOW", "LOW-MOD", "MODERATE", "HIGH"]
+
+# Parse-time dtypes for index.csv, so neither parser has to infer them
+INDEX_DTYPES = {
+    'case_id': 'str',
+    'fold': 'int8',
+    'y_true': 'int8',
+    'p_calibrated': 'float64',
+    'uncertainty_std': 'float64',
+}
+
+
+def _read_csv(path: Path, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Read a CSV with Polars' multithreaded parser when installed, else pandas."""
+    if pl is not None:
+        overrides = {col: _POLARS_DTYPES[kind] for col, kind in (dtype or {}).items()}
+        try:
+            return pl.read_csv(path, infer_schema_length=1000, schema_overrides=overrides).to_pandas()
+        except OSError:
+            raise
+        except Exception:
+            # Polars infers from the first rows only; let pandas parse the whole file
+            pass
+    try:
+        return pd.read_csv(path, dtype=dtype, engine=_CSV_ENGINE)
+    except OSError:
+        raise
+    except Exception:
+        if dtype is None:
+            raise
+        # Values that don't fit the declared dtypes: fall back to inference
+        return pd.read_csv(path, engine=_CSV_ENGINE)
+
+
+def _read_json(path: Path) -> Dict:
+    """Parse a JSON file with orjson when installed, else the json module."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity tokens json.dump writes by default
+            pass
+    return json.loads(raw)
+
+
+def optimize_index_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Use compact dtypes for the index columns that are filtered and counted."""
+    if 'risk_band' in df.columns:
+        extra = sorted(set(df['risk_band'].dropna().astype(str)) - set(RISK_BANDS))
+        df['risk_band'] = pd.Categorical(df['risk_band'], categories=RISK_BANDS + extra)
+    for col in ('fold', 'y_true'):
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype('int8')
+    return df
 
 
 def load_index_csv(results_root: Path) -> Optional[pd.DataFrame]:
     """Load index.csv from explainability_reports folder."""
     index_path = results_root / "explainability_reports" / "index.csv"
-    if not index_path.exists():
-        return None
     try:
-        df = pd.read_csv(index_path)
+        df = _read_csv(index_path, dtype=INDEX_DTYPES)
         if 'case_id' in df.columns:
             df['case_id'] = df['case_id'].astype(str)
-        return df
+        return optimize_index_dtypes(df)
     except Exception:
         return None
 
@@ -27,10 +102,8 @@ def load_index_csv(results_root: Path) -> Optional[pd.DataFrame]:
 def load_case_mapping(results_root: Path) -> Optional[pd.DataFrame]:
     """Load case_mapping.csv from explainability_reports folder."""
     mapping_path = results_root / "explainability_reports" / "case_mapping.csv"
-    if not mapping_path.exists():
-        return None
     try:
-        df = pd.read_csv(mapping_path)
+        df = _read_csv(mapping_path)
         if 'case_id' in df.columns:
             df['case_id'] = df['case_id'].astype(str)
         return df
@@ -38,21 +111,24 @@ def load_case_mapping(results_root: Path) -> Optional[pd.DataFrame]:
         return None
 
 
-def get_explainability_image_path(results_root: Path, case_id: str) -> Optional[Path]:
-    """Get path to explainability image for a case if it exists."""
-    image_path = results_root / "explainability_reports" / f"{case_id}.png"
-    if image_path.exists():
-        return image_path
-    return None
+def build_image_index(results_root: Path) -> Dict[str, Path]:
+    """Map case id to explainability PNG path from one listing of the reports folder."""
+    index = {}
+    try:
+        with os.scandir(os.path.join(results_root, "explainability_reports")) as entries:
+            for entry in entries:
+                if entry.name.endswith(".png") and entry.is_file():
+                    index[entry.name[:-4]] = Path(entry.path)
+    except OSError:
+        pass
+    return index
 
 
 def load_metrics_summary(results_root: Path) -> Optional[pd.DataFrame]:
     """Load patient_metrics_summary.csv if it exists."""
     metrics_path = results_root / "patient_metrics_summary.csv"
-    if not metrics_path.exists():
-        return None
     try:
-        return pd.read_csv(metrics_path)
+        return _read_csv(metrics_path)
     except Exception:
         return None
 
@@ -60,11 +136,8 @@ def load_metrics_summary(results_root: Path) -> Optional[pd.DataFrame]:
 def load_run_config(results_root: Path) -> Optional[Dict]:
     """Load run_config.json if it exists."""
     config_path = results_root / "run_config.json"
-    if not config_path.exists():
-        return None
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return _read_json(config_path)
     except Exception:
         return None
 
@@ -75,36 +148,66 @@ def validate_results_structure(results_root: Path) -> Tuple[bool, list]:
         "explainability_reports/index.csv",
         "explainability_reports/case_mapping.csv"
     ]
-    missing = []
-    for req in required:
-        path = results_root / req
-        if not path.exists():
-            missing.append(req)
+    root = str(results_root)
+    missing = [req for req in required if not os.path.isfile(os.path.join(root, req))]
     return len(missing) == 0, missing
 
 
+def get_results_mtime(results_root: Path) -> float:
+    """Latest modification time of the result files, used to invalidate caches."""
+    # Directory mtimes catch the artifact images check_artifacts looks for
+    candidates = [
+        ".",
+        "calibration_plots",
+        "explainability_reports",
+        "explainability_reports/index.csv",
+        "explainability_reports/case_mapping.csv",
+        "patient_metrics_summary.csv",
+        "run_config.json",
+    ]
+    mtime = 0.0
+    for name in candidates:
+        try:
+            mtime = max(mtime, (results_root / name).stat().st_mtime)
+        except OSError:
+            continue
+    return mtime
+
+
 def check_artifacts(results_root: Path) -> Dict[str, bool]:
     """Check which artifacts are available without exposing paths."""
-    artifacts = {
-        'index_csv': (results_root / "explainability_reports" / "index.csv").exists(),
-        'case_mapping': (results_root / "explainability_reports" / "case_mapping.csv").exists(),
-        'metrics_summary': (results_root / "patient_metrics_summary.csv").exists(),
-        'run_config': (results_root / "run_config.json").exists(),
-        'calibration_plots': (results_root / "calibration_plots").exists() and len(list((results_root / "calibration_plots").glob("*.png"))) > 0,
-        'roc_curves': (results_root / "roc_curves_patient_level.png").exists(),
-        'pr_curves': (results_root / "pr_curves_patient_level.png").exists(),
-        'confusion_matrix': (results_root / "confusion_matrices_patient_level.png").exists(),
+    root = str(results_root)
+    explain_dir = os.path.join(root, "explainability_reports")
+    artifact_files = {
+        'index_csv': os.path.join(explain_dir, "index.csv"),
+        'case_mapping': os.path.join(explain_dir, "case_mapping.csv"),
+        'metrics_summary': os.path.join(root, "patient_metrics_summary.csv"),
+        'run_config': os.path.join(root, "run_config.json"),
+        'roc_curves': os.path.join(root, "roc_curves_patient_level.png"),
+        'pr_curves': os.path.join(root, "pr_curves_patient_level.png"),
+        'confusion_matrix': os.path.join(root, "confusion_matrices_patient_level.png"),
     }
+    artifacts = {key: os.path.isfile(path) for key, path in artifact_files.items()}
+    
+    # Stop at the first calibration plot
+    artifacts['calibration_plots'] = False
+    try:
+        with os.scandir(os.path.join(root, "calibration_plots")) as entries:
+            artifacts['calibration_plots'] = any(entry.name.endswith(".png") for entry in entries)
+    except OSError:
+        pass
     
-    # Check for case images
-    explain_dir = results_root / "explainability_reports"
-    if explain_dir.exists():
-        case_images = list(explain_dir.glob("Case-*.png"))
-        artifacts['case_images'] = len(case_images) > 0
-        artifacts['case_image_count'] = len(case_images)
-    else:
-        artifacts['case_images'] = False
-        artifacts['case_image_count'] = 0
+    # Count case images in a single directory read
+    case_image_count = 0
+    try:
+        with os.scandir(explain_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("Case-") and entry.name.endswith(".png"):
+                    case_image_count += 1
+    except OSError:
+        pass
+    artifacts['case_images'] = case_image_count > 0
+    artifacts['case_image_count'] = case_image_count
     
     return artifacts
 
@@ -114,44 +217,75 @@ def generate_demo_data() -> pd.DataFrame:
     np.random.seed(42)
     n_cases = 25
     
-    case_ids = [f"Case-{i:02d}" for i in range(1, n_cases + 1)]
+    ids = np.arange(1, n_cases + 1).astype(str)
+    case_ids = np.char.add("Case-", np.char.zfill(ids, 2))
     folds = np.random.choice([0, 1, 2], size=n_cases)
     y_true = np.random.choice([0, 1], size=n_cases, p=[0.15, 0.85])
     p_calibrated = np.random.beta(3, 4, size=n_cases)
     uncertainty_std = np.random.uniform(0.02, 0.15, size=n_cases)
     
-    risk_bands = []
-    for p in p_calibrated:
-        if p < 0.3:
-            risk_bands.append("LOW")
-        elif p < 0.5:
-            risk_bands.append("LOW-MOD")
-        elif p < 0.75:
-            risk_bands.append("MODERATE")
-        else:
-            risk_bands.append("HIGH")
+    bands = np.array(RISK_BANDS)
+    risk_bands = bands[np.searchsorted([0.3, 0.5, 0.75], p_calibrated, side='right')]
     
     df = pd.DataFrame({
         'case_id': case_ids,
-        'patient_id': [f"DEMO-{i}" for i in range(1, n_cases + 1)],
+        'patient_id': np.char.add("DEMO-", ids),
         'fold': folds,
         'y_true': y_true,
         'p_calibrated': p_calibrated,
         'uncertainty_std': uncertainty_std,
         'risk_band': risk_bands
-    })
+    }, copy=False)
     
-    return df
+    return optimize_index_dtypes(df)
+
+
+def dataframe_fingerprint(df: Optional[pd.DataFrame]) -> str:
+    """Content fingerprint of an index frame, computed once at load as a cache key."""
+    if df is None:
+        return "none"
+    return f"{len(df)}:{int(pd.util.hash_pandas_object(df, index=False).sum())}"
+
+
+def _present_values(col: pd.Series) -> list:
+    """Distinct non-null values of a column; categoricals keep category order."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(col.cat.categories))
+        return [value for value, count in zip(col.cat.categories.tolist(), counts) if count > 0]
+    return sorted(col.dropna().unique().tolist())
+
+
+def get_filter_options(index_df: Optional[pd.DataFrame]) -> Dict:
+    """Precompute the global filter bar's option lists from the index."""
+    if index_df is None or index_df.empty:
+        return {}
+    return {
+        'risk_bands': _present_values(index_df['risk_band']) if 'risk_band' in index_df.columns else [],
+        'folds': _present_values(index_df['fold']) if 'fold' in index_df.columns else [],
+        'has_probability': 'p_calibrated' in index_df.columns,
+        'uncert_max': float(index_df['uncertainty_std'].max()) if 'uncertainty_std' in index_df.columns else None,
+    }
+
+
+def build_case_lookup(index_df: pd.DataFrame) -> Dict[str, Dict]:
+    """Map each case_id to its row as a dict, keeping the first row per case."""
+    unique_cases = index_df.drop_duplicates('case_id')
+    return unique_cases.set_index('case_id', drop=False).to_dict(orient='index')
 
 
 def load_all_data(results_root: Path, demo_mode: bool = False):
     """Load all data with caching."""
     if demo_mode:
+        index_df = generate_demo_data()
         return {
-            'index_df': generate_demo_data(),
+            'index_df': index_df,
+            'index_fingerprint': dataframe_fingerprint(index_df),
+            'filter_options': get_filter_options(index_df),
             'case_mapping': None,
             'metrics_summary': None,
             'run_config': None,
+            'image_paths': {},
             'artifacts': {
                 'index_csv': True,
                 'case_mapping': True,
@@ -175,9 +309,12 @@ def load_all_data(results_root: Path, demo_mode: bool = False):
     
     return {
         'index_df': index_df,
+        'index_fingerprint': dataframe_fingerprint(index_df),
+        'filter_options': get_filter_options(index_df),
         'case_mapping': case_mapping,
         'metrics_summary': metrics_summary,
         'run_config': run_config,
+        'image_paths': build_image_index(results_root),
         'artifacts': artifacts,
         'is_demo': False
     }
@@ -194,28 +331,60 @@ def filter_dataframe(
     uncert_max: float = None
 ) -> pd.DataFrame:
     """Filter dataframe based on various criteria."""
-    filtered = df.copy()
+    mask = np.ones(len(df), dtype=bool)
     
     if risk_bands and len(risk_bands) > 0:
-        filtered = filtered[filtered['risk_band'].isin(risk_bands)]
+        mask &= df['risk_band'].isin(risk_bands).to_numpy()
     
     if y_true_values is not None and len(y_true_values) > 0:
-        filtered = filtered[filtered['y_true'].isin(y_true_values)]
+        mask &= df['y_true'].isin(y_true_values).to_numpy()
     
     if folds and len(folds) > 0:
-        filtered = filtered[filtered['fold'].isin(folds)]
+        mask &= df['fold'].isin(folds).to_numpy()
     
     if prob_min is not None:
-        filtered = filtered[filtered['p_calibrated'] >= prob_min]
+        mask &= df['p_calibrated'].to_numpy() >= prob_min
     
     if prob_max is not None:
-        filtered = filtered[filtered['p_calibrated'] <= prob_max]
+        mask &= df['p_calibrated'].to_numpy() <= prob_max
     
     if uncert_min is not None:
-        filtered = filtered[filtered['uncertainty_std'] >= uncert_min]
+        mask &= df['uncertainty_std'].to_numpy() >= uncert_min
     
     if uncert_max is not None:
-        filtered = filtered[filtered['uncertainty_std'] <= uncert_max]
+        mask &= df['uncertainty_std'].to_numpy() <= uncert_max
     
-    return filtered
+    return df[mask]
+
+
+def top_n_rows(df: pd.DataFrame, column: str, n: int = 5) -> pd.DataFrame:
+    """Return the n rows with the largest values in column, largest first."""
+    vals = df[column].to_numpy(dtype=float)
+    candidates = np.flatnonzero(~np.isnan(vals))
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-vals[candidates], n - 1)[:n]]
+    order = candidates[np.argsort(-vals[candidates], kind='stable')]
+    return df.iloc[order]
 
+
+def sample_per_risk_band(df: pd.DataFrame, max_points: int = 2000) -> pd.DataFrame:
+    """Stratified sample of at most max_points rows, split evenly across risk bands."""
+    if len(df) <= max_points:
+        return df
+    if 'risk_band' not in df.columns:
+        return df.sample(n=max_points, random_state=0)
+    shuffled = df.sample(frac=1, random_state=0)
+    n_bands = max(shuffled['risk_band'].nunique(), 1)
+    rank = shuffled.groupby('risk_band', observed=True).cumcount().to_numpy()
+    return shuffled[rank < max_points // n_bands]
+
+
+def probability_histogram(df: pd.DataFrame, bins: int = 25) -> pd.DataFrame:
+    """Bin calibrated probabilities up front so charts only receive the counts."""
+    values = df['p_calibrated'].to_numpy(dtype=float)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    return pd.DataFrame({
+        'p_calibrated': (edges[:-1] + edges[1:]) / 2,
+        'count': counts,
+        'width': np.diff(edges),
+    })
@@ -5,15 +5,22 @@ Provides reusable components: cards, badges, hero banner, filter bar, sidebar co
 
 import streamlit as st
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import json
+from functools import lru_cache
 import plotly.graph_objects as go
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def render_hero_banner():
-    """Render premium hero banner for dashboard."""
-    st.markdown("""
+# st.fragment needs Streamlit 1.37+; older releases render the card as a plain function
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Static HTML blocks, built once at import so every rerun sends an identical body
+_HERO_HTML = """
     <div class="hero-banner">
         <div style="position: relative; z-index: 1;">
             <h1 class="hero-title">MASLD Results Dashboard</h1>
@@ -21,21 +28,15 @@ def render_hero_banner():
         </div>
         <div class="hero-illustration">🩺</div>
     </div>
-    """, unsafe_allow_html=True)
-
+    """
 
-def render_demo_banner():
-    """Render demo mode banner."""
-    st.markdown("""
+_DEMO_HTML = """
     <div class="demo-banner">
         🔶 DEMO MODE ACTIVE — Using synthetic data for UI preview only
     </div>
-    """, unsafe_allow_html=True)
-
+    """
 
-def render_sidebar_brand_header():
-    """Render premium branded sidebar header."""
-    st.sidebar.markdown("""
+_SIDEBAR_BRAND_HTML = """
     <div class="sidebar-brand-header">
         <div class="sidebar-brand-title">
             <div class="sidebar-brand-icon">🩺</div>
@@ -43,7 +44,22 @@ def render_sidebar_brand_header():
         </div>
         <p class="sidebar-brand-subtitle">Ultrasound ML Results</p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_hero_banner():
+    """Render premium hero banner for dashboard."""
+    st.markdown(_HERO_HTML, unsafe_allow_html=True)
+
+
+def render_demo_banner():
+    """Render demo mode banner."""
+    st.markdown(_DEMO_HTML, unsafe_allow_html=True)
+
+
+def render_sidebar_brand_header():
+    """Render premium branded sidebar header."""
+    st.sidebar.markdown(_SIDEBAR_BRAND_HTML, unsafe_allow_html=True)
 
 
 def render_sidebar_nav_pills(current_page: str):
@@ -54,35 +70,18 @@ def render_sidebar_nav_pills(current_page: str):
         ("📈", "Performance & Run Info", "Performance & Run Info"),
     ]
     
-    st.sidebar.markdown('<div class="sidebar-nav-container">', unsafe_allow_html=True)
-    
-    for icon, label, page_key in pages:
-        is_active = current_page == page_key
-        active_class = "active" if is_active else ""
-        st.sidebar.markdown(f"""
-        <div class="sidebar-nav-pill {active_class}" style="position: relative;">
-            <span class="sidebar-nav-icon">{icon}</span>
-            <span>{label}</span>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.sidebar.markdown('</div>', unsafe_allow_html=True)
+    pills_html = "".join(
+        f'<div class="sidebar-nav-pill {"active" if current_page == page_key else ""}" style="position: relative;">'
+        f'<span class="sidebar-nav-icon">{icon}</span>'
+        f'<span>{label}</span>'
+        f'</div>'
+        for icon, label, page_key in pages
+    )
+    st.sidebar.markdown(f'<div class="sidebar-nav-container">{pills_html}</div>', unsafe_allow_html=True)
 
 
-def render_sidebar_status_card(data: dict):
-    """Render status summary card in sidebar."""
-    index_df = data.get('index_df')
-    artifacts = data.get('artifacts', {})
-    
-    if index_df is None or index_df.empty:
-        return
-    
-    n_cases = len(index_df)
-    n_high_risk = len(index_df[index_df['risk_band'] == 'HIGH']) if 'risk_band' in index_df.columns else 0
-    pct_high = (n_high_risk / n_cases * 100) if n_cases > 0 else 0
-    n_images = artifacts.get('case_image_count', 0)
-    
-    st.sidebar.markdown("""
+# Sidebar status card; only the footer timestamp differs between reruns
+_STATUS_TEMPLATE = """
     <div class="sidebar-status-card">
         <div class="sidebar-status-title">
             <span>📊</span>
@@ -90,22 +89,47 @@ def render_sidebar_status_card(data: dict):
         </div>
         <div class="sidebar-status-metric">
             <span class="sidebar-status-label">Cases Loaded</span>
-            <span class="sidebar-status-value">{}</span>
+            <span class="sidebar-status-value">{n_cases}</span>
         </div>
         <div class="sidebar-status-metric">
             <span class="sidebar-status-label">High Risk</span>
-            <span class="sidebar-status-value">{:.1f}%</span>
+            <span class="sidebar-status-value">{pct_high:.1f}%</span>
         </div>
         <div class="sidebar-status-metric">
             <span class="sidebar-status-label">Images Available</span>
-            <span class="sidebar-status-value">{}</span>
-        </div>
-        <div class="sidebar-status-metric" style="margin-top: 0.5rem; padding-top: 0.75rem; border-top: 1px solid #e2e8f0;">
-            <span class="sidebar-status-label" style="font-size: 0.75rem; color: #a0aec0;">Last Loaded</span>
-            <span class="sidebar-status-value" style="font-size: 0.75rem; color: #718096;">{}</span>
+            <span class="sidebar-status-value">{n_images}</span>
         </div>
     </div>
-    """.format(n_cases, pct_high, n_images, datetime.now().strftime("%H:%M")), unsafe_allow_html=True)
+    """
+
+_STATUS_FOOTER = """
+    <div class="sidebar-status-footer">
+        <span>Last Loaded</span>
+        <span class="sidebar-status-footer-value">{}</span>
+    </div>
+    """
+
+
+def render_sidebar_status_card(data: dict):
+    """Render status summary card in sidebar."""
+    index_df = data.get('index_df')
+    artifacts = data.get('artifacts', {})
+    
+    if index_df is None or index_df.empty:
+        return
+    
+    n_cases = len(index_df)
+    n_high_risk = int((index_df['risk_band'] == 'HIGH').sum()) if 'risk_band' in index_df.columns else 0
+    pct_high = (n_high_risk / n_cases * 100) if n_cases > 0 else 0
+    n_images = artifacts.get('case_image_count', 0)
+    
+    st.sidebar.markdown(_STATUS_TEMPLATE.format_map({
+        'n_cases': n_cases,
+        'pct_high': pct_high,
+        'n_images': n_images,
+    }), unsafe_allow_html=True)
+    # The timestamp changes every rerun, so keep it out of the summary block
+    st.sidebar.markdown(_STATUS_FOOTER.format(datetime.now().strftime("%H:%M")), unsafe_allow_html=True)
 
 
 def render_connection_status(connected: bool, folder_name: str = None):
@@ -125,66 +149,84 @@ def render_connection_status(connected: bool, folder_name: str = None):
         """, unsafe_allow_html=True)
 
 
-def render_kpi_card_clickable(title: str, value: str, icon: str = "", subtitle: str = "", 
-                               color: str = "default", key: str = None, clickable: bool = False):
-    """Render a premium KPI card."""
-    color_map = {
-        "default": "linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%)",
-        "blue": "linear-gradient(135deg, #E5F5FF 0%, #F0F9FF 100%)",
-        "green": "linear-gradient(135deg, #E5FFE5 0%, #F0FFF0 100%)",
-        "yellow": "linear-gradient(135deg, #FFF4E5 0%, #FFFBF0 100%)",
-        "pink": "linear-gradient(135deg, #FFE5E5 0%, #FFF0F5 100%)",
-    }
-    bg = color_map.get(color, color_map["default"])
-    
-    click_class = "kpi-card" if clickable else "premium-card"
+# KPI card backgrounds by color name
+_KPI_BACKGROUNDS = {
+    "default": "linear-gradient(135deg, #f7fafc 0%, #edf2f7 100%)",
+    "blue": "linear-gradient(135deg, #E5F5FF 0%, #F0F9FF 100%)",
+    "green": "linear-gradient(135deg, #E5FFE5 0%, #F0FFF0 100%)",
+    "yellow": "linear-gradient(135deg, #FFF4E5 0%, #FFFBF0 100%)",
+    "pink": "linear-gradient(135deg, #FFE5E5 0%, #FFF0F5 100%)",
+}
+
+
+def _kpi_card_html(title: str, value: str, icon: str = "", subtitle: str = "",
+                   color: str = "default") -> str:
+    """Build the HTML for one KPI card."""
+    bg = _KPI_BACKGROUNDS.get(color, _KPI_BACKGROUNDS["default"])
+    icon_html = f'<div style="font-size: 1.5rem; opacity: 0.6;">{icon}</div>' if icon else ''
+    subtitle_html = f'<div style="font-size: 0.8rem; color: #a0aec0; margin-top: 0.3rem;">{subtitle}</div>' if subtitle else ''
+    return (
+        f'<div class="premium-card" style="background: {bg};">'
+        f'<div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">'
+        f'<div style="font-size: 0.85rem; color: #718096; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">{title}</div>'
+        f'{icon_html}'
+        f'</div>'
+        f'<div class="kpi-value">{value}</div>'
+        f'{subtitle_html}'
+        f'</div>'
+    )
+
+
+def render_kpi_row(cards: List[Dict]):
+    """Render a row of KPI cards in one markdown call.
     
-    st.markdown(f"""
-    <div class="{click_class}" style="background: {bg};">
-        <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
-            <div style="font-size: 0.85rem; color: #718096; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">
-                {title}
-            </div>
-            {f'<div style="font-size: 1.5rem; opacity: 0.6;">{icon}</div>' if icon else ''}
-        </div>
-        <div class="kpi-value">{value}</div>
-        {f'<div style="font-size: 0.8rem; color: #a0aec0; margin-top: 0.3rem;">{subtitle}</div>' if subtitle else ''}
-    </div>
-    """, unsafe_allow_html=True)
+    Each card is a dict of _kpi_card_html arguments (title, value, icon, subtitle, color).
+    """
+    if not cards:
+        return
+    cards_html = "".join(_kpi_card_html(**card) for card in cards)
+    st.markdown(f'<div class="kpi-row">{cards_html}</div>', unsafe_allow_html=True)
 
 
 def render_risk_gauge(value: float, case_id: str = ""):
     """Render plotly gauge for risk level."""
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = value * 100,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': f"Risk Level{(' - ' + case_id) if case_id else ''}", 'font': {'size': 16}},
-        gauge = {
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "darkblue"},
-            'steps': [
-                {'range': [0, 30], 'color': "#C6F6D5"},
-                {'range': [30, 50], 'color': "#FEFCBF"},
-                {'range': [50, 75], 'color': "#FED7AA"},
-                {'range': [75, 100], 'color': "#FED7D7"}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 90
+    title = f"Risk Level{(' - ' + case_id) if case_id else ''}"
+    return go.Figure(_build_gauge_dict(round(value * 100, 2), title))
+
+
+@lru_cache(maxsize=256)
+def _build_gauge_dict(value_pct: float, title: str) -> dict:
+    """Build the gauge trace and layout once per (value, title) as a plain dict."""
+    return {
+        'data': [{
+            'type': 'indicator',
+            'mode': "gauge+number",
+            'value': value_pct,
+            'domain': {'x': [0, 1], 'y': [0, 1]},
+            'title': {'text': title, 'font': {'size': 16}},
+            'gauge': {
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "darkblue"},
+                'steps': [
+                    {'range': [0, 30], 'color': "#C6F6D5"},
+                    {'range': [30, 50], 'color': "#FEFCBF"},
+                    {'range': [50, 75], 'color': "#FED7AA"},
+                    {'range': [75, 100], 'color': "#FED7D7"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 90
+                }
             }
+        }],
+        'layout': {
+            'height': 250,
+            'margin': dict(l=20, r=20, t=40, b=20),
+            'paper_bgcolor': 'rgba(0,0,0,0)',
+            'font': dict(size=12)
         }
-    ))
-    
-    fig.update_layout(
-        height=250,
-        margin=dict(l=20, r=20, t=40, b=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12)
-    )
-    
-    return fig
+    }
 
 
 def render_uncertainty_meter(value: float, max_value: float = 0.2):
@@ -210,127 +252,145 @@ def render_uncertainty_meter(value: float, max_value: float = 0.2):
     """, unsafe_allow_html=True)
 
 
-def render_global_filter_bar(index_df, key_prefix="global"):
+def render_global_filter_bar(filter_options: Dict, key_prefix="global"):
     """Render collapsible global filter bar with active filter chips."""
-    if index_df is None or index_df.empty:
+    if not filter_options:
         return {}
+    uncert_max = filter_options.get('uncert_max')
+    
+    # Session state keys for this filter bar
+    k_risk = f'{key_prefix}_risk_bands'
+    k_y_true = f'{key_prefix}_y_true'
+    k_folds = f'{key_prefix}_folds'
+    k_prob = f'{key_prefix}_prob_range'
+    k_uncert = f'{key_prefix}_uncert_range'
+    
+    # Initialize session state for filters
+    state = st.session_state
+    state.setdefault(k_risk, [])
+    state.setdefault(k_y_true, [])
+    state.setdefault(k_folds, [])
+    state.setdefault(k_prob, (0.0, 1.0))
+    state.setdefault(k_uncert, (0.0, uncert_max if uncert_max is not None else 0.2))
     
     # Show active filters outside expander
-    if f'{key_prefix}_risk_bands' in st.session_state and st.session_state[f'{key_prefix}_risk_bands']:
+    if state[k_risk]:
         st.markdown("**Active Filters:**", unsafe_allow_html=True)
-        active_chips = st.container()
-        with active_chips:
-            for band in st.session_state[f'{key_prefix}_risk_bands']:
-                st.markdown(f'<span class="filter-chip active">Risk: {band}</span>', unsafe_allow_html=True)
-            if st.session_state.get(f'{key_prefix}_y_true'):
-                labels = ["Healthy" if x == 0 else "MASLD" for x in st.session_state[f'{key_prefix}_y_true']]
-                st.markdown(f'<span class="filter-chip active">Class: {", ".join(labels)}</span>', unsafe_allow_html=True)
+        chips_html = "".join(f'<span class="filter-chip active">Risk: {band}</span>' for band in state[k_risk])
+        if state[k_y_true]:
+            labels = ["Healthy" if x == 0 else "MASLD" for x in state[k_y_true]]
+            chips_html += f'<span class="filter-chip active">Class: {", ".join(labels)}</span>'
+        st.markdown(f'<div class="chip-row">{chips_html}</div>', unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
     
     # Collapsible filter controls
     with st.expander("🔧 Global Filters", expanded=False):
-        # Initialize session state for filters
-        if f'{key_prefix}_risk_bands' not in st.session_state:
-            st.session_state[f'{key_prefix}_risk_bands'] = []
-        if f'{key_prefix}_y_true' not in st.session_state:
-            st.session_state[f'{key_prefix}_y_true'] = []
-        if f'{key_prefix}_folds' not in st.session_state:
-            st.session_state[f'{key_prefix}_folds'] = []
-        if f'{key_prefix}_prob_range' not in st.session_state:
-            st.session_state[f'{key_prefix}_prob_range'] = (0.0, 1.0)
-        if f'{key_prefix}_uncert_range' not in st.session_state:
-            uncert_max = index_df['uncertainty_std'].max() if 'uncertainty_std' in index_df.columns else 0.2
-            st.session_state[f'{key_prefix}_uncert_range'] = (0.0, float(uncert_max))
-        
         filter_cols = st.columns(5)
         
         with filter_cols[0]:
             risk_bands = st.multiselect(
                 "Risk Band",
-                options=sorted(index_df['risk_band'].unique()) if 'risk_band' in index_df.columns else [],
-                default=st.session_state[f'{key_prefix}_risk_bands'],
+                options=filter_options.get('risk_bands', []),
+                default=state[k_risk],
                 key=f"{key_prefix}_risk_select"
             )
-            st.session_state[f'{key_prefix}_risk_bands'] = risk_bands
+            state[k_risk] = risk_bands
         
         with filter_cols[1]:
             y_true_options = st.multiselect(
                 "Class",
                 options=[0, 1],
                 format_func=lambda x: "Healthy" if x == 0 else "MASLD",
-                default=st.session_state[f'{key_prefix}_y_true'],
+                default=state[k_y_true],
                 key=f"{key_prefix}_class_select"
             )
-            st.session_state[f'{key_prefix}_y_true'] = y_true_options
+            state[k_y_true] = y_true_options
         
         with filter_cols[2]:
             folds = st.multiselect(
                 "Fold",
-                options=sorted(index_df['fold'].unique()) if 'fold' in index_df.columns else [],
-                default=st.session_state[f'{key_prefix}_folds'],
+                options=filter_options.get('folds', []),
+                default=state[k_folds],
                 key=f"{key_prefix}_fold_select"
             )
-            st.session_state[f'{key_prefix}_folds'] = folds
+            state[k_folds] = folds
         
         with filter_cols[3]:
-            if 'p_calibrated' in index_df.columns:
+            if filter_options.get('has_probability'):
                 prob_range = st.slider(
                     "Probability",
                     min_value=0.0,
                     max_value=1.0,
-                    value=st.session_state[f'{key_prefix}_prob_range'],
+                    value=state[k_prob],
                     step=0.01,
                     key=f"{key_prefix}_prob_slider"
                 )
-                st.session_state[f'{key_prefix}_prob_range'] = prob_range
+                state[k_prob] = prob_range
             else:
                 prob_range = (0.0, 1.0)
         
         with filter_cols[4]:
-            if 'uncertainty_std' in index_df.columns:
-                uncert_max = index_df['uncertainty_std'].max()
+            if uncert_max is not None:
                 uncert_range = st.slider(
                     "Uncertainty",
                     min_value=0.0,
                     max_value=float(uncert_max),
-                    value=st.session_state[f'{key_prefix}_uncert_range'],
+                    value=state[k_uncert],
                     step=0.01,
                     key=f"{key_prefix}_uncert_slider"
                 )
-                st.session_state[f'{key_prefix}_uncert_range'] = uncert_range
+                state[k_uncert] = uncert_range
             else:
                 uncert_range = (0.0, 1.0)
         
         if st.button("🔄 Reset Filters", key=f"{key_prefix}_reset", use_container_width=True):
-            st.session_state[f'{key_prefix}_risk_bands'] = []
-            st.session_state[f'{key_prefix}_y_true'] = []
-            st.session_state[f'{key_prefix}_folds'] = []
-            st.session_state[f'{key_prefix}_prob_range'] = (0.0, 1.0)
-            if 'uncertainty_std' in index_df.columns:
-                uncert_max = index_df['uncertainty_std'].max()
-                st.session_state[f'{key_prefix}_uncert_range'] = (0.0, float(uncert_max))
+            state[k_risk] = []
+            state[k_y_true] = []
+            state[k_folds] = []
+            state[k_prob] = (0.0, 1.0)
+            if uncert_max is not None:
+                state[k_uncert] = (0.0, uncert_max)
             st.rerun()
     
     return {
-        'risk_bands': st.session_state.get(f'{key_prefix}_risk_bands', []),
-        'y_true': st.session_state.get(f'{key_prefix}_y_true', []),
-        'folds': st.session_state.get(f'{key_prefix}_folds', []),
-        'prob_range': st.session_state.get(f'{key_prefix}_prob_range', (0.0, 1.0)),
-        'uncert_range': st.session_state.get(f'{key_prefix}_uncert_range', (0.0, 1.0))
+        'risk_bands': tuple(state[k_risk]),
+        'y_true': tuple(state[k_y_true]),
+        'folds': tuple(state[k_folds]),
+        'prob_range': tuple(state[k_prob]),
+        'uncert_range': tuple(state[k_uncert])
     }
 
 
+# Map risk band to CSS class
+_RISK_CLASS_MAP = {
+    'LOW': 'low',
+    'LOW-MOD': 'low-mod',
+    'MODERATE': 'moderate',
+    'HIGH': 'high'
+}
+
+# Finished badge HTML for every known band, in upper and lower case
+_BADGE_HTML = {
+    label: f'<span class="risk-badge {risk_class}">{label}</span>'
+    for band, risk_class in _RISK_CLASS_MAP.items()
+    for label in (band, band.lower())
+}
+
+
 def render_risk_badge(risk_band: str) -> str:
     """Get HTML for risk band badge."""
-    # Map risk band to CSS class
-    risk_class_map = {
-        'LOW': 'low',
-        'LOW-MOD': 'low-mod',
-        'MODERATE': 'moderate',
-        'HIGH': 'high'
-    }
-    risk_class = risk_class_map.get(risk_band.upper(), 'low')
-    return f'<span class="risk-badge {risk_class}">{risk_band}</span>'
+    badge = _BADGE_HTML.get(risk_band)
+    if badge is None:
+        risk_class = _RISK_CLASS_MAP.get(str(risk_band).upper(), 'low')
+        badge = f'<span class="risk-badge {risk_class}">{risk_band}</span>'
+    return badge
+
+
+# (status icon, status colour) for available / missing artifacts
+_ARTIFACT_STATUS = {
+    True: ("✅", "#22543D"),
+    False: ("❌", "#742A2A"),
+}
 
 
 def render_artifact_cards(artifacts: dict):
@@ -346,28 +406,29 @@ def render_artifact_cards(artifacts: dict):
         ("📊", "PR Curves", artifacts.get('pr_curves', False)),
     ]
     
-    cols = st.columns(4)
-    for idx, item in enumerate(artifact_list):
-        with cols[idx % 4]:
-            if len(item) == 4:
-                icon, label, available, count = item
-                detail = f"{count} images" if available and count > 0 else ("Available" if available else "Missing")
-            else:
-                icon, label, available = item
-                detail = "Available" if available else "Missing"
-            
-            status_icon = "✅" if available else "❌"
-            status_color = "#22543D" if available else "#742A2A"
-            st.markdown(f"""
-            <div class="artifact-card">
-                <div class="artifact-icon">{icon}</div>
-                <div class="artifact-label">{label}</div>
-                <div class="artifact-status" style="color: {status_color};">{status_icon} {detail}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    cards = []
+    for item in artifact_list:
+        if len(item) == 4:
+            icon, label, available, count = item
+            detail = f"{count} images" if available and count > 0 else ("Available" if available else "Missing")
+        else:
+            icon, label, available = item
+            detail = "Available" if available else "Missing"
+        
+        status_icon, status_color = _ARTIFACT_STATUS[bool(available)]
+        cards.append(
+            f'<div class="artifact-card">'
+            f'<div class="artifact-icon">{icon}</div>'
+            f'<div class="artifact-label">{label}</div>'
+            f'<div class="artifact-status" style="color: {status_color};">{status_icon} {detail}</div>'
+            f'</div>'
+        )
+    
+    st.markdown(f'<div class="artifact-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
 
 
-def render_case_detail_card(case_data: dict, image_path: Optional[Path], results_root: Path):
+@_fragment
+def render_case_detail_card(case_data: dict, image_bytes: Optional[bytes], results_root: Path):
     """Render detailed case information card with gauges."""
     case_id = case_data.get('case_id', 'N/A')
     risk_band = case_data.get('risk_band', 'N/A')
@@ -427,23 +488,22 @@ def render_case_detail_card(case_data: dict, image_path: Optional[Path], results
     # Explainability image
     st.markdown("### Explainability Visualization", unsafe_allow_html=True)
     
-    if image_path and image_path.exists():
+    if image_bytes is not None:
         zoom_col1, zoom_col2 = st.columns([1, 4])
         with zoom_col1:
             full_width = st.checkbox("Full Width", key=f"zoom_{case_id}")
         
-        st.image(str(image_path), use_container_width=full_width)
+        st.image(image_bytes, use_container_width=full_width)
         
         col1, col2 = st.columns(2)
         with col1:
-            with open(image_path, 'rb') as f:
-                st.download_button(
-                    label="📥 Download Image",
-                    data=f.read(),
-                    file_name=f"{case_id}.png",
-                    mime="image/png",
-                    use_container_width=True
-                )
+            st.download_button(
+                label="📥 Download Image",
+                data=image_bytes,
+                file_name=f"{case_id}.png",
+                mime="image/png",
+                use_container_width=True
+            )
     else:
         st.markdown("""
         <div style="background: #f7fafc;
@@ -485,7 +545,10 @@ def render_case_detail_card(case_data: dict, image_path: Optional[Path], results
         'true_label': label_text,
         'fold': int(case_data.get('fold', -1))
     }
-    json_str = json.dumps(case_summary, indent=2)
+    if orjson is not None:
+        json_str = orjson.dumps(case_summary, option=orjson.OPT_INDENT_2).decode()
+    else:
+        json_str = json.dumps(case_summary, indent=2)
     st.download_button(
         label="📥 Download Case Summary (JSON)",
         data=json_str,
@@ -98,7 +98,8 @@ def generate_demo_data() -> pd.DataFrame:
     n_cases = 20
     
     # Generate demo case IDs
-    case_ids = [f"Case-{i:02d}" for i in range(1, n_cases + 1)]
+    ids = np.arange(1, n_cases + 1).astype(str)
+    case_ids = np.char.add("Case-", np.char.zfill(ids, 2))
     
     # Generate synthetic data
     folds = np.random.choice([0, 1, 2], size=n_cases)
@@ -107,26 +108,18 @@ def generate_demo_data() -> pd.DataFrame:
     uncertainty_std = np.random.uniform(0.02, 0.15, size=n_cases)
     
     # Assign risk bands based on probability
-    risk_bands = []
-    for p in p_calibrated:
-        if p < 0.3:
-            risk_bands.append("LOW")
-        elif p < 0.6:
-            risk_bands.append("LOW-MOD")
-        elif p < 0.8:
-            risk_bands.append("MODERATE")
-        else:
-            risk_bands.append("HIGH")
+    bands = np.array(["LOW", "LOW-MOD", "MODERATE", "HIGH"])
+    risk_bands = bands[np.digitize(p_calibrated, [0.3, 0.6, 0.8])]
     
     df = pd.DataFrame({
         'case_id': case_ids,
-        'patient_id': [f"DEMO-{i}" for i in range(1, n_cases + 1)],  # Clearly demo
+        'patient_id': np.char.add("DEMO-", ids),  # Clearly demo
         'fold': folds,
         'y_true': y_true,
         'p_calibrated': p_calibrated,
         'uncertainty_std': uncertainty_std,
         'risk_band': risk_bands
-    })
+    }, copy=False)
     
     return df
 
@@ -142,30 +135,30 @@ def filter_dataframe(
     uncert_max: float = None
 ) -> pd.DataFrame:
     """Filter dataframe based on various criteria."""
-    filtered = df.copy()
+    mask = np.ones(len(df), dtype=bool)
     
     if risk_bands and len(risk_bands) > 0:
-        filtered = filtered[filtered['risk_band'].isin(risk_bands)]
+        mask &= df['risk_band'].isin(risk_bands).to_numpy()
     
     if y_true_values is not None and len(y_true_values) > 0:
-        filtered = filtered[filtered['y_true'].isin(y_true_values)]
+        mask &= df['y_true'].isin(y_true_values).to_numpy()
     
     if folds and len(folds) > 0:
-        filtered = filtered[filtered['fold'].isin(folds)]
+        mask &= df['fold'].isin(folds).to_numpy()
     
     if prob_min is not None:
-        filtered = filtered[filtered['p_calibrated'] >= prob_min]
+        mask &= df['p_calibrated'].to_numpy() >= prob_min
     
     if prob_max is not None:
-        filtered = filtered[filtered['p_calibrated'] <= prob_max]
+        mask &= df['p_calibrated'].to_numpy() <= prob_max
     
     if uncert_min is not None:
-        filtered = filtered[filtered['uncertainty_std'] >= uncert_min]
+        mask &= df['uncertainty_std'].to_numpy() >= uncert_min
     
     if uncert_max is not None:
-        filtered = filtered[filtered['uncertainty_std'] <= uncert_max]
+        mask &= df['uncertainty_std'].to_numpy() <= uncert_max
     
-    return filtered
+    return df[mask]
 
 
 def get_risk_band_color(risk_band: str) -> str:
@@ -184,18 +177,22 @@ def compute_summary_metrics(df: pd.DataFrame) -> Dict:
     if df.empty:
         return {}
     
+    n_cases = len(df)
+    cols = set(df.columns)
+    # Labels may be missing, so count each class rather than deriving one from the other
+    yt = df['y_true'].to_numpy(dtype=float, na_value=np.nan) if 'y_true' in cols else None
     metrics = {
-        'n_cases': len(df),
-        'n_masld': int(df['y_true'].sum()) if 'y_true' in df.columns else 0,
-        'n_healthy': int((df['y_true'] == 0).sum()) if 'y_true' in df.columns else 0,
-        'mean_probability': float(df['p_calibrated'].mean()) if 'p_calibrated' in df.columns else 0.0,
-        'mean_uncertainty': float(df['uncertainty_std'].mean()) if 'uncertainty_std' in df.columns else 0.0,
+        'n_cases': n_cases,
+        'n_masld': int(np.nansum(yt)) if yt is not None else 0,
+        'n_healthy': int((yt == 0).sum()) if yt is not None else 0,
+        'mean_probability': float(df['p_calibrated'].mean()) if 'p_calibrated' in cols else 0.0,
+        'mean_uncertainty': float(df['uncertainty_std'].mean()) if 'uncertainty_std' in cols else 0.0,
     }
     
     # Risk band distribution
-    if 'risk_band' in df.columns:
-        risk_counts = df['risk_band'].value_counts().to_dict()
-        metrics['risk_band_dist'] = risk_counts
+    if 'risk_band' in cols:
+        bands, counts = np.unique(df['risk_band'].dropna().to_numpy(), return_counts=True)
+        metrics['risk_band_dist'] = dict(zip(bands.tolist(), counts.tolist()))
     
     return metrics
 